@@ -1,17 +1,32 @@
 #!/usr/bin/env python3
 
-import boto3
-import json
+import orjson
+import sys
+
+from _client import bedrock_rt as client, make_client
+
+# Model listing is a control plane operation, served by the bedrock service
+bedrock = make_client('bedrock')
+
+def list_model_pages():
+    """Yield pages of foundation model summaries."""
+    if bedrock.can_paginate('list_foundation_models'):
+        paginator = bedrock.get_paginator('list_foundation_models')
+        yield from paginator.paginate(PaginationConfig={'PageSize': 100})
+    else:
+        yield bedrock.list_foundation_models()
 
-client = boto3.client(service_name='bedrock-runtime', region_name="us-west-2")
 
 def list_bedrock_models():
     try:
-        response = client.list_foundation_models()
-        for model in response['modelSummaries']:
-            print(f"Model ID: {model['modelId']}")
-            print(f"Provider: {model['providerName']}")
-            print(f"Model Name: {model['modelName']}")
+        for page in list_model_pages():
+            # One buffered write per page
+            sys.stdout.write(''.join(
+                f"Model ID: {model['modelId']}\n"
+                f"Provider: {model['providerName']}\n"
+                f"Model Name: {model['modelName']}\n"
+                for model in page['modelSummaries']
+            ))
     except Exception as e:
         print(f"Error listing models: {str(e)}")
     finally:
@@ -20,20 +35,27 @@ def list_bedrock_models():
 
 def generate_text(prompt, max_tokens=100):
     try:
-        body = json.dumps({
+        body = orjson.dumps({
             "prompt": prompt,
             "max_tokens_to_sample": max_tokens,
             "temperature": 1,
             "top_p": 0.1
         })
 
-        response = client.invoke_model(
+        response = client.invoke_model_with_response_stream(
             modelId="anthropic.claude-instant-v1",
             body=body
         )
 
-        response_body = json.loads(response.get('body').read())
-        return response_body.get('completion')
+        # Print the completion as it arrives
+        completion = []
+        for event in response.get('body'):
+            chunk = orjson.loads(event['chunk']['bytes'])
+            text = chunk.get('completion', '')
+            print(text, end='', flush=True)
+            completion.append(text)
+        print()
+        return ''.join(completion)
     except Exception as e:
         print(f"Error generating text: {str(e)}")
         return None
@@ -47,7 +69,5 @@ list_bedrock_models()
 
 # Test text generation
 prompt = "Tell me a short joke"
+print("\nGenerated text:")
 response = generate_text(prompt)
-if response:
-    print("\nGenerated text:")
-    print(response)
@@ -1,28 +1,47 @@
 #!/usr/bin/env python3
 
-import boto3
-import json
+import orjson
+import threading
+
+
+# Serializes client creation between the warm-up thread and the main thread
+_client_lock = threading.Lock()
+
+
+def get_client(region_name="us-west-2"):
+    """Return the shared Bedrock runtime client for a region."""
+    with _client_lock:
+        # Imported lazily: loading boto3 is slow and the prompt should show at once
+        from _client import make_client
+        return make_client('bedrock-runtime', region_name)
 
 
 def call_bedrock_model(prompt):
     """Call Bedrock model with the given prompt."""
     try:
-        client = boto3.client(service_name='bedrock-runtime', region_name="us-west-2")
+        client = get_client()
         
-        body = json.dumps({
+        body = orjson.dumps({
             "prompt": prompt,
             "max_tokens_to_sample": 500,
             "temperature": 1,
             "top_p": 0.1
         })
 
-        response = client.invoke_model(
+        response = client.invoke_model_with_response_stream(
             modelId="anthropic.claude-instant-v1",
             body=body
         )
 
-        response_body = json.loads(response.get('body').read())
-        return response_body.get('completion')
+        # Print the completion as it arrives
+        completion = []
+        for event in response.get('body'):
+            chunk = orjson.loads(event['chunk']['bytes'])
+            text = chunk.get('completion', '')
+            print(text, end='', flush=True)
+            completion.append(text)
+        print()
+        return ''.join(completion)
     except Exception as e:
         print(f"Error calling Bedrock model: {str(e)}")
         return None
@@ -36,6 +55,9 @@ def main():
     
     history = []
     
+    # Load boto3 and build the client while the user types
+    threading.Thread(target=get_client, daemon=True).start()
+    
     try:
         while True:
             user_input = input("\nUser: ").strip()
@@ -46,11 +68,10 @@ def main():
                 
                 # Call Bedrock model
                 print("\nCalling Bedrock model...")
+                print("\nAssistant: ", end='', flush=True)
                 response = call_bedrock_model(user_input)
                 
-                if response:
-                    print(f"\nAssistant: {response}")
-                else:
+                if not response:
                     print("\nFailed to get response from Bedrock model.")
             else:
                 print("Empty input, please enter something.")
@@ -1,26 +1,43 @@
 #!/usr/bin/env python3
 
-import boto3
-import json
-import base64
+import orjson
+import pybase64
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-# Initialize Bedrock Runtime client
-client = boto3.client(service_name='bedrock-runtime', region_name='us-west-2')
+from _client import bedrock_rt as client
 
-def generate_cat_image():
+# Match the base64 images in the response body, without parsing the JSON
+IMAGES_PATTERN = re.compile(rb'"images"\s*:\s*\[([^\]]*)\]')
+IMAGE_PATTERN = re.compile(rb'"([^"]+)"')
+
+
+def save_image(filename, image_data):
+    """Write image bytes to a file."""
+    with open(filename, 'wb') as f:
+        f.write(image_data)
+
+
+def generate_cat_image(number_of_images=1):
     """
-    Generate an image of a cat using AWS Bedrock's Amazon Titan Image Generator
+    Generate images of a cat using AWS Bedrock's Amazon Titan Image Generator
+    
+    Args:
+        number_of_images (int): How many images to generate (1 to 5)
+        
+    Returns:
+        list: The filenames of the saved images, or None on failure
     """
     try:
         # Prepare the request body for Amazon Titan Image Generator
-        request_body = json.dumps({
+        request_body = orjson.dumps({
             "taskType": "TEXT_IMAGE",
             "textToImageParams": {
                 "text": "a cute cat, high quality, detailed, photorealistic"
             },
             "imageGenerationConfig": {
-                "numberOfImages": 1,
+                "numberOfImages": number_of_images,
                 "quality": "standard",
                 "cfgScale": 8.0,
                 "height": 512,
@@ -42,25 +59,31 @@ def generate_cat_image():
             contentType="application/json"
         )
         
-        # Parse the response
-        response_body = json.loads(response['body'].read())
-        
-        # Extract the base64 encoded image
-        image_base64 = response_body['images'][0]
+        # Extract the base64 encoded images straight from the raw body
+        raw_body = response['body'].read()
+        match = IMAGES_PATTERN.search(raw_body)
+        if match:
+            images_base64 = IMAGE_PATTERN.findall(match.group(1))
+        else:
+            images_base64 = orjson.loads(raw_body)['images']
         
-        # Decode the image
-        image_data = base64.b64decode(image_base64)
+        # Decode the images (SIMD base64 decoder)
+        images_data = [pybase64.b64decode(image, validate=False) for image in images_base64]
         
-        # Generate filename with timestamp
+        # Generate filenames with timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"cat_image_{timestamp}.png"
+        if len(images_data) == 1:
+            filenames = [f"cat_image_{timestamp}.png"]
+        else:
+            filenames = [f"cat_image_{timestamp}_{i}.png" for i in range(1, len(images_data) + 1)]
         
-        # Save the image
-        with open(filename, 'wb') as f:
-            f.write(image_data)
+        # Save the images concurrently
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(save_image, filenames, images_data))
         
-        print(f"✓ Image successfully generated and saved as: {filename}")
-        return filename
+        for filename in filenames:
+            print(f"✓ Image successfully generated and saved as: {filename}")
+        return filenames
         
     except Exception as e:
         print(f"Error with Amazon Titan: {str(e)}")
@@ -1,12 +1,12 @@
 #!/usr/bin/env python3
 
-import boto3
-import json
+import orjson
 import base64
+import re
 
-client = boto3.client(service_name='bedrock-runtime', region_name="us-west-2")
+from _client import bedrock_rt as client
 
-stability_image_config = json.dumps({
+stability_image_config = orjson.dumps({
     "prompt": "a photo of a cat"
 })
 
@@ -16,8 +16,13 @@ response = client.invoke_model(
     accept="application/json", 
     contentType="application/json")
 
-response_body = json.loads(response.get("body").read())
-base64_image = response_body.get("images")[0]
+# Extract the first base64 image from the raw body, without parsing the JSON
+raw_body = response.get("body").read()
+match = re.search(rb'"images"\s*:\s*\[\s*"([^"]+)"', raw_body)
+if match:
+    base64_image = match.group(1)
+else:
+    base64_image = orjson.loads(raw_body).get("images")[0]
 
 base_64_image = base64.b64decode(base64_image)
 
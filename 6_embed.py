@@ -1,15 +1,13 @@
 #!/usr/bin/env python3
 
-import boto3
-import json
-
-client = boto3.client(service_name="bedrock-runtime", region_name="us-west-2")
+import orjson
 
+from _client import bedrock_rt as client
 fact = "The first moon landing was in 1969."
 animal = "cat"
 
 response = client.invoke_model(
-    body=json.dumps(
+    body=orjson.dumps(
         {
             "inputText": animal,
         }
@@ -19,5 +17,5 @@ response = client.invoke_model(
     contentType="application/json",
 )
 
-response_body = json.loads(response.get("body").read())
+response_body = orjson.loads(response.get("body").read())
 print(response_body.get("embedding"))
@@ -1,10 +1,9 @@
 #!/usr/bin/env python3
 
-import boto3
-import json
+import orjson
 
-from similarity import cosineSimilarity
-client = boto3.client(service_name='bedrock-runtime', region_name="us-west-2")
+from _client import bedrock_rt as client
+from similarity import cosineSimilarityBatch
 
 facts = [
     'The first computer was invented in the 1940s.',
@@ -19,14 +18,14 @@ question = 'Who is the president of USA?'
 
 def getEmbedding(input: str):
     response = client.invoke_model(
-        body=json.dumps({
+        body=orjson.dumps({
             "inputText": input,
         }), 
         modelId='amazon.titan-embed-text-v1', 
         accept='application/json', 
         contentType='application/json')
 
-    response_body = json.loads(response.get('body').read())
+    response_body = orjson.loads(response.get('body').read())
     return response_body.get('embedding')
 
 factsWithEmbeddings = []
@@ -39,12 +38,17 @@ for fact in facts:
 
 newFactEmbedding = getEmbedding(question)
 
+scores = cosineSimilarityBatch(
+    newFactEmbedding,
+    [fact['embedding'] for fact in factsWithEmbeddings]
+)
+
 similarities = []
 
-for fact in factsWithEmbeddings:
+for fact, score in zip(factsWithEmbeddings, scores):
     similarities.append({
         'text': fact['text'],
-        'similarity': cosineSimilarity(fact['embedding'], newFactEmbedding)
+        'similarity': float(score)
     })
 
 print(f"Similarities for fact: '{question}' with:")
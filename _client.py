@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Shared AWS clients
+
+All scripts create their clients from one botocore session, so each
+service model is loaded only once per process. The session's JSON
+response parser uses orjson.
+"""
+
+import functools
+
+import boto3
+import botocore.session
+import orjson
+from botocore.config import Config
+from botocore.parsers import BaseJSONParser
+
+import prewarm
+
+# Read pickled botocore service models when prewarm.py has been run
+prewarm.install()
+
+REGION_NAME = "us-west-2"
+
+# Keep connections alive and pooled across calls, with adaptive retries
+# (up to 3 attempts in total)
+CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={'total_max_attempts': 3, 'mode': 'adaptive'}
+)
+
+
+def _parse_body_as_json(self, body_contents):
+    """Parse a JSON response body with orjson."""
+    if not body_contents:
+        return {}
+    try:
+        return orjson.loads(body_contents)
+    except orjson.JSONDecodeError:
+        # if the body cannot be parsed, include the literal string as the message
+        return {'message': body_contents.decode(self.DEFAULT_ENCODING)}
+
+
+BaseJSONParser._parse_body_as_json = _parse_body_as_json
+
+SESSION = boto3.Session(botocore_session=botocore.session.get_session())
+
+
+@functools.lru_cache(maxsize=None)
+def _make_client(service_name, region_name):
+    """Create a client; always called with both arguments positional."""
+    return SESSION.client(service_name=service_name, region_name=region_name, config=CONFIG)
+
+
+def make_client(service_name, region_name=None):
+    """Return a client for the service, created once per service and region."""
+    return _make_client(service_name, region_name or REGION_NAME)
+
+
+bedrock_rt = make_client('bedrock-runtime')
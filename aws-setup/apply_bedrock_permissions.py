@@ -4,16 +4,26 @@ AWS Bedrock Permissions Auto-Apply Script
 
 This script automatically applies Bedrock full access permissions to your current AWS user.
 It will:
-1. Check AWS CLI is configured
+1. Check AWS credentials are configured
 2. Get your current AWS username
 3. Apply the Bedrock full access policy
 4. Verify the permissions were applied
 """
 
 import json
-import subprocess
 import sys
-import os
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import (
+    BotoCoreError,
+    ClientError,
+    ConnectTimeoutError,
+    ReadTimeoutError,
+)
+
+sts = boto3.client('sts')
+iam = boto3.client('iam')
 
 # IAM Policy for full Bedrock access
 BEDROCK_FULL_ACCESS_POLICY = {
@@ -42,58 +52,36 @@ def print_header():
     print("  AWS BEDROCK PERMISSIONS AUTO-APPLY SCRIPT")
     print("█" * 80 + "\n")
 
-def check_aws_cli():
-    """Check if AWS CLI is installed and configured."""
-    print("🔍 Checking AWS CLI configuration...")
-    try:
-        result = subprocess.run(
-            ['aws', '--version'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        print(f"✓ AWS CLI found: {result.stdout.strip()}")
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        print("❌ ERROR: AWS CLI not found or not configured.")
-        print("\nPlease install and configure AWS CLI:")
-        print("  1. Install: https://aws.amazon.com/cli/")
+def check_aws_credentials():
+    """Check if AWS credentials are configured."""
+    print("🔍 Checking AWS credentials configuration...")
+    credentials = boto3.Session().get_credentials()
+    if credentials is None:
+        print("❌ ERROR: AWS credentials not found or not configured.")
+        print("\nPlease configure your AWS credentials:")
+        print("  1. Install AWS CLI: https://aws.amazon.com/cli/")
         print("  2. Configure: aws configure")
         return False
+    print(f"✓ AWS credentials found (method: {credentials.method})")
+    return True
 
 def get_caller_identity():
     """Get the current AWS caller identity."""
     try:
-        result = subprocess.run(
-            ['aws', 'sts', 'get-caller-identity'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        identity = json.loads(result.stdout)
-        return identity
-    except subprocess.CalledProcessError as e:
-        print(f"❌ ERROR: Could not get AWS identity: {e.stderr}")
-        return None
-    except json.JSONDecodeError:
-        print("❌ ERROR: Could not parse AWS identity response.")
+        return sts.get_caller_identity()
+    except (BotoCoreError, ClientError) as e:
+        print(f"❌ ERROR: Could not get AWS identity: {e}")
         return None
 
 def get_username():
     """Get the current AWS username."""
     print("\n🔍 Getting your AWS username...")
     try:
-        result = subprocess.run(
-            ['aws', 'iam', 'get-user'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        user_info = json.loads(result.stdout)
+        user_info = iam.get_user()
         username = user_info['User']['UserName']
         print(f"✓ Username: {username}")
         return username
-    except subprocess.CalledProcessError as e:
+    except (BotoCoreError, ClientError, KeyError):
         print(f"⚠ Could not get username directly. Trying to extract from ARN...")
         # Try to get username from caller identity
         identity = get_caller_identity()
@@ -107,34 +95,22 @@ def get_username():
         print(f"❌ ERROR: Could not determine username.")
         return None
 
-def save_policy_to_file(filename="bedrock-full-access-policy.json"):
-    """Save the policy to a JSON file."""
-    with open(filename, 'w') as f:
-        json.dump(BEDROCK_FULL_ACCESS_POLICY, f, indent=2)
-    return os.path.abspath(filename)
-
-def apply_inline_policy(username, policy_file):
+def apply_inline_policy(username):
     """Apply the policy as an inline policy to the user."""
     print(f"\n🚀 Applying Bedrock permissions to user: {username}...")
     print("   Policy type: Inline Policy")
     print("   Policy name: BedrockFullAccess")
     
     try:
-        result = subprocess.run(
-            [
-                'aws', 'iam', 'put-user-policy',
-                '--user-name', username,
-                '--policy-name', 'BedrockFullAccess',
-                '--policy-document', f'file://{policy_file}'
-            ],
-            capture_output=True,
-            text=True,
-            check=True
+        iam.put_user_policy(
+            UserName=username,
+            PolicyName='BedrockFullAccess',
+            PolicyDocument=json.dumps(BEDROCK_FULL_ACCESS_POLICY)
         )
         print("✓ Policy applied successfully!")
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ ERROR: Failed to apply policy: {e.stderr}")
+    except (BotoCoreError, ClientError) as e:
+        print(f"❌ ERROR: Failed to apply policy: {e}")
         return False
 
 def try_managed_policy(username):
@@ -142,86 +118,94 @@ def try_managed_policy(username):
     print(f"\n🚀 Trying to attach AWS Managed Policy (AmazonBedrockFullAccess)...")
     
     try:
-        result = subprocess.run(
-            [
-                'aws', 'iam', 'attach-user-policy',
-                '--user-name', username,
-                '--policy-arn', 'arn:aws:iam::aws:policy/AmazonBedrockFullAccess'
-            ],
-            capture_output=True,
-            text=True,
-            check=True
+        iam.attach_user_policy(
+            UserName=username,
+            PolicyArn='arn:aws:iam::aws:policy/AmazonBedrockFullAccess'
         )
         print("✓ AWS Managed Policy attached successfully!")
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"⚠ Could not attach managed policy: {e.stderr.strip()}")
+    except (BotoCoreError, ClientError) as e:
+        print(f"⚠ Could not attach managed policy: {e}")
         return False
 
+def get_user_details(username):
+    """Get the authorization details (inline and attached policies) of a user."""
+    paginator = iam.get_paginator('get_account_authorization_details')
+    for page in paginator.paginate(Filter=['User'], PaginationConfig={'PageSize': 200}):
+        for user_detail in page['UserDetailList']:
+            if user_detail['UserName'] == username:
+                return user_detail
+    return None
+
+def get_user_policies(username):
+    """Get the inline policy names and attached managed policies of a user."""
+    try:
+        # A single call when the account-wide permission is available
+        user_detail = get_user_details(username)
+        if user_detail is None:
+            return None
+        inline_policies = [policy['PolicyName'] for policy in user_detail.get('UserPolicyList', [])]
+        return inline_policies, user_detail.get('AttachedManagedPolicies', [])
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') != 'AccessDenied':
+            raise
+    
+    # Fall back to the per-user calls, which users managing themselves can make
+    inline_policies = iam.list_user_policies(UserName=username).get('PolicyNames', [])
+    attached_policies = iam.list_attached_user_policies(UserName=username).get('AttachedPolicies', [])
+    return inline_policies, attached_policies
+
 def verify_policy_applied(username):
     """Verify the policy was applied."""
     print(f"\n🔍 Verifying policies for user: {username}...")
     
-    # Check inline policies
     try:
-        result = subprocess.run(
-            ['aws', 'iam', 'list-user-policies', '--user-name', username],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        policies = json.loads(result.stdout)
-        inline_policies = policies.get('PolicyNames', [])
-        if inline_policies:
-            print(f"✓ Inline policies found: {', '.join(inline_policies)}")
-    except subprocess.CalledProcessError:
-        print("⚠ Could not list inline policies")
+        user_policies = get_user_policies(username)
+    except (BotoCoreError, ClientError):
+        print("⚠ Could not fetch user policies")
+        return
+    if user_policies is None:
+        print(f"⚠ User {username} not found in account authorization details")
+        return
+    inline_policies, attached_policies = user_policies
+    
+    # Check inline policies
+    if inline_policies:
+        print(f"✓ Inline policies found: {', '.join(inline_policies)}")
     
     # Check attached managed policies
-    try:
-        result = subprocess.run(
-            ['aws', 'iam', 'list-attached-user-policies', '--user-name', username],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        policies = json.loads(result.stdout)
-        attached_policies = policies.get('AttachedPolicies', [])
-        if attached_policies:
-            print(f"✓ Attached managed policies:")
-            for policy in attached_policies:
-                print(f"   - {policy['PolicyName']} ({policy['PolicyArn']})")
-    except subprocess.CalledProcessError:
-        print("⚠ Could not list attached policies")
+    if attached_policies:
+        print(f"✓ Attached managed policies:")
+        for policy in attached_policies:
+            print(f"   - {policy['PolicyName']} ({policy['PolicyArn']})")
+
+def list_foundation_models():
+    """List the Bedrock foundation models visible to the current user."""
+    # A single attempt, with about 30 seconds of connect and read timeouts
+    # (read_timeout applies per socket read, not to the whole call)
+    config = Config(connect_timeout=10, read_timeout=20, retries={'total_max_attempts': 1})
+    bedrock = boto3.client('bedrock', region_name='us-west-2', config=config)
+    return bedrock.list_foundation_models()['modelSummaries']
 
 def test_bedrock_access():
     """Test if Bedrock access is working."""
     print(f"\n🧪 Testing Bedrock access...")
-    print("   Running: python3 ../1_bedrock.py")
+    print("   Listing foundation models in us-west-2")
     
     try:
-        result = subprocess.run(
-            ['python3', '../1_bedrock.py'],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        
-        if result.returncode == 0:
-            print("✓ Bedrock access test PASSED!")
-            print("\nSample output:")
-            lines = result.stdout.split('\n')[:10]
-            for line in lines:
-                if line.strip():
-                    print(f"   {line}")
-            return True
-        else:
-            print("❌ Bedrock access test FAILED!")
-            print(f"\nError output:\n{result.stderr}")
-            return False
-    except subprocess.TimeoutExpired:
+        models = list_foundation_models()
+        print("✓ Bedrock access test PASSED!")
+        print(f"\nFound {len(models)} models. Sample:")
+        for model in models[:3]:
+            print(f"   {model['modelId']} ({model['providerName']})")
+        return True
+    except (ConnectTimeoutError, ReadTimeoutError):
         print("⚠ Test timed out (this might be normal if there are many models)")
         return None
+    except (BotoCoreError, ClientError) as e:
+        print("❌ Bedrock access test FAILED!")
+        print(f"\nError output:\n{e}")
+        return False
     except Exception as e:
         print(f"⚠ Could not run test: {e}")
         return None
@@ -230,8 +214,8 @@ def main():
     """Main function."""
     print_header()
     
-    # Step 1: Check AWS CLI
-    if not check_aws_cli():
+    # Step 1: Check AWS credentials
+    if not check_aws_credentials():
         sys.exit(1)
     
     # Step 2: Get caller identity
@@ -247,16 +231,11 @@ def main():
     if not username:
         sys.exit(1)
     
-    # Step 4: Save policy to file
-    print("\n📝 Saving policy to file...")
-    policy_file = save_policy_to_file()
-    print(f"✓ Policy saved to: {policy_file}")
-    
-    # Step 5: Try to attach AWS managed policy first (recommended)
+    # Step 4: Try to attach AWS managed policy first (recommended)
     managed_success = try_managed_policy(username)
     
-    # Step 6: Apply inline policy (as backup or additional)
-    inline_success = apply_inline_policy(username, policy_file)
+    # Step 5: Apply inline policy (as backup or additional)
+    inline_success = apply_inline_policy(username)
     
     if not managed_success and not inline_success:
         print("\n❌ FAILED: Could not apply any policies.")
@@ -266,10 +245,10 @@ def main():
         print("\nPlease contact your AWS administrator or use the AWS Console.")
         sys.exit(1)
     
-    # Step 7: Verify
+    # Step 6: Verify
     verify_policy_applied(username)
     
-    # Step 8: Test access
+    # Step 7: Test access
     test_result = test_bedrock_access()
     
     # Final summary
@@ -1,23 +1,33 @@
 #!/usr/bin/env python3
 
-import boto3
+import io
 import json
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 
-# Initialize Bedrock client
-client = boto3.client(service_name='bedrock-runtime', region_name="us-west-2")
+from _client import bedrock_rt as client
 
-# Mock database of CPF to user names for demonstration
+# Skip the second model call and answer from a template when every tool
+# call succeeded (tool results are deterministic lookups)
+SKIP_SUMMARY_CALL = False
+
+# Pretty-print full model responses and tool inputs
+DEBUG = False
+
+# Maximum number of tool calls executed concurrently
+MAX_TOOL_WORKERS = 8
+
+# Mock database of CPF to user names for demonstration, keyed by unformatted CPF
 CPF_DATABASE = {
-    "123.456.789-00": "João da Silva",
-    "987.654.321-00": "Maria Santos",
-    "111.222.333-44": "Pedro Oliveira",
-    "555.666.777-88": "Ana Costa",
-    "12345678900": "João da Silva",  # Also accept without formatting
+    "12345678900": "João da Silva",
     "98765432100": "Maria Santos",
     "11122233344": "Pedro Oliveira",
     "55566677788": "Ana Costa"
 }
 
+# Translation table stripping CPF formatting characters
+_CPF_FORMATTING = str.maketrans('', '', './- ')
+
 
 def cpf_to_username(cpf):
     """
@@ -31,77 +41,165 @@ def cpf_to_username(cpf):
         str: The full name associated with the CPF, or an error message
     """
     # Normalize CPF by removing formatting characters
-    normalized_cpf = ''.join(char for char in cpf if char.isdigit())
-
-    # Try to find in database (try both formatted and unformatted)
-    if cpf in CPF_DATABASE:
-        return CPF_DATABASE[cpf]
-    elif normalized_cpf in CPF_DATABASE:
-        return CPF_DATABASE[normalized_cpf]
-    else:
+    normalized_cpf = cpf.translate(_CPF_FORMATTING)
+
+    name = CPF_DATABASE.get(normalized_cpf)
+    if name is None:
         return f"CPF {cpf} not found in database"
+    return name
 
 
-def invoke_model_with_tools(user_message):
+# Tools the model may call, by name
+TOOLS = {
+    "cpf_to_username": cpf_to_username,
+}
+
+# Tool specifications sent to the model
+TOOL_SPECS = [
+    {
+        "name": "cpf_to_username",
+        "description": "Converts a Brazilian CPF (Cadastro de Pessoas Físicas) number to the full name of the person. The CPF can be provided with or without formatting (dots and dashes).",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "cpf": {
+                    "type": "string",
+                    "description": "The CPF number to look up. Can be formatted (e.g., 123.456.789-00) or unformatted (e.g., 12345678900)"
+                }
+            },
+            "required": ["cpf"]
+        }
+    }
+]
+
+# Model configuration
+MODEL_ID = "anthropic.claude-3-sonnet-20240229-v1:0"
+
+# Serialized request body without its closing brace; the messages are
+# appended to it on every call instead of re-serializing the whole body
+REQUEST_PREFIX = orjson.dumps({
+    "anthropic_version": "bedrock-2023-05-31",
+    "max_tokens": 500,
+    "tools": TOOL_SPECS
+})[:-1]
+
+
+def build_request_body(messages):
+    """
+    Assemble a request body from already serialized messages.
+    
+    Args:
+        messages (list): Messages, each serialized with orjson.dumps
+        
+    Returns:
+        bytes: The JSON request body
+    """
+    return REQUEST_PREFIX + b',"messages":[' + b','.join(messages) + b']}'
+
+
+def run_tool(tool_name, tool_input):
+    """
+    Execute a registered tool.
+    
+    Args:
+        tool_name (str): Name of the tool in TOOLS
+        tool_input (dict): Keyword arguments for the tool
+        
+    Returns:
+        tuple: (result, is_error), where result is the tool's return value
+    """
+    if tool_name not in TOOLS:
+        return f"Unknown tool: {tool_name}", True
+    try:
+        return TOOLS[tool_name](**tool_input), False
+    except Exception as e:
+        return f"Error running tool {tool_name}: {str(e)}", True
+
+
+def stream_model_response(model_id, request_body, out=None):
+    """
+    Invoke Bedrock model with a streamed response, printing text as it arrives.
+    
+    Args:
+        model_id (str): The Bedrock model ID
+        request_body (bytes): The serialized Anthropic messages request body
+        out (file): Where the text is printed (default: stdout)
+        
+    Returns:
+        str: The full text of the response
+    """
+    response = client.invoke_model_with_response_stream(
+        modelId=model_id,
+        body=request_body
+    )
+    
+    text_parts = []
+    for event in response['body']:
+        chunk = event.get('chunk')
+        if not chunk:
+            continue
+        payload = orjson.loads(chunk['bytes'])
+        if payload.get('type') == 'content_block_delta':
+            text = payload['delta'].get('text', '')
+            print(text, end='', flush=True, file=out)
+            text_parts.append(text)
+    print(file=out)
+    
+    return ''.join(text_parts)
+
+
+def extract_text(response_body):
+    """
+    Concatenate the text blocks of a model response.
+    
+    Args:
+        response_body (dict): The parsed Anthropic messages response
+        
+    Returns:
+        str: The text of the response
+    """
+    final_response = ""
+    for block in response_body.get('content', []):
+        if block.get('type') == 'text':
+            final_response += block.get('text', '')
+    return final_response
+
+
+def invoke_model_with_tools(user_message, stream=True, out=None):
     """
     Invoke Bedrock model with tool calling capability.
     
     Args:
         user_message (str): The user's message/query
+        stream (bool): Print the final answer as it arrives
+        out (file): Where progress lines are printed (default: stdout)
         
     Returns:
         str: The final response from the model
     """
-    # Define the tool specification
-    tools = [
-        {
-            "name": "cpf_to_username",
-            "description": "Converts a Brazilian CPF (Cadastro de Pessoas Físicas) number to the full name of the person. The CPF can be provided with or without formatting (dots and dashes).",
-            "input_schema": {
-                "type": "object",
-                "properties": {
-                    "cpf": {
-                        "type": "string",
-                        "description": "The CPF number to look up. Can be formatted (e.g., 123.456.789-00) or unformatted (e.g., 12345678900)"
-                    }
-                },
-                "required": ["cpf"]
-            }
-        }
-    ]
-    
-    # Prepare the initial message
+    # Prepare the initial message; messages are kept serialized
     messages = [
-        {
+        orjson.dumps({
             "role": "user",
             "content": user_message
-        }
+        })
     ]
     
-    # Model configuration
-    model_id = "anthropic.claude-3-sonnet-20240229-v1:0"
-    
     # First API call - send the query with tool definitions
-    print(f"User: {user_message}")
-    print("-" * 50)
-    
-    request_body = {
-        "anthropic_version": "bedrock-2023-05-31",
-        "max_tokens": 500,
-        "tools": tools,
-        "messages": messages
-    }
+    print(f"User: {user_message}", file=out)
+    print("-" * 50, file=out)
     
     try:
         response = client.invoke_model(
-            modelId=model_id,
-            body=json.dumps(request_body)
+            modelId=MODEL_ID,
+            body=build_request_body(messages)
         )
         
-        response_body = json.loads(response['body'].read())
-        print("Model response (first call):")
-        print(json.dumps(response_body, indent=2))
-        print("-" * 50)
+        response_body = orjson.loads(response['body'].read())
+        if DEBUG:
+            print("Model response (first call):", file=out)
+            print(json.dumps(response_body, indent=2), file=out)
+            print("-" * 50, file=out)
         
         # Check if model wants to use a tool
         stop_reason = response_body.get('stop_reason')
@@ -115,62 +213,83 @@ def invoke_model_with_tools(user_message):
                 "role": "assistant",
                 "content": content_blocks
             }
-            messages.append(assistant_message)
+            messages.append(orjson.dumps(assistant_message))
+            
+            # Collect the tool use requests in the response
+            tool_blocks = [block for block in content_blocks if block.get('type') == 'tool_use']
+            for block in tool_blocks:
+                print(f"Model wants to use tool: {block.get('name')}", file=out)
+                if DEBUG:
+                    print(f"Tool input: {json.dumps(block.get('input', {}), indent=2)}", file=out)
+                else:
+                    print(f"Tool input: {block.get('input', {})}", file=out)
+                print("-" * 50, file=out)
+            
+            # Execute the tools concurrently, keeping the original order; every
+            # tool_use needs a tool_result, so unknown tools are reported by run_tool
+            all_succeeded = True
+            with ThreadPoolExecutor(max_workers=MAX_TOOL_WORKERS) as executor:
+                futures = [
+                    executor.submit(run_tool, block.get('name'), block.get('input', {}))
+                    for block in tool_blocks
+                ]
             
-            # Process each tool use in the response
             tool_results = []
-            for block in content_blocks:
-                if block.get('type') == 'tool_use':
-                    tool_name = block.get('name')
-                    tool_input = block.get('input', {})
-                    tool_use_id = block.get('id')
-                    
-                    print(f"Model wants to use tool: {tool_name}")
-                    print(f"Tool input: {json.dumps(tool_input, indent=2)}")
-                    print("-" * 50)
-                    
-                    # Execute the tool
-                    if tool_name == 'cpf_to_username':
-                        cpf = tool_input.get('cpf', '')
-                        result = cpf_to_username(cpf)
-                        print(f"Tool result: {result}")
-                        print("-" * 50)
-                        
-                        tool_results.append({
-                            "type": "tool_result",
-                            "tool_use_id": tool_use_id,
-                            "content": result
-                        })
+            lookups = []
+            for block, future in zip(tool_blocks, futures):
+                result, is_error = future.result()
+                print(f"Tool result: {result}", file=out)
+                print("-" * 50, file=out)
+                
+                # tool_result content must be a string or a list of content
+                # blocks: strings pass through, anything else is JSON-encoded
+                # once into a single text block
+                if isinstance(result, str):
+                    content = result
+                else:
+                    content = [{"type": "text", "text": orjson.dumps(result).decode()}]
+                tool_result = {
+                    "type": "tool_result",
+                    "tool_use_id": block.get('id'),
+                    "content": content
+                }
+                if is_error:
+                    tool_result["is_error"] = True
+                    all_succeeded = False
+                tool_results.append(tool_result)
+                
+                tool_input = block.get('input', {})
+                lookups.append((', '.join(str(value) for value in tool_input.values()), result))
+            
+            # Answer from the tool results directly, without a second call
+            if SKIP_SUMMARY_CALL and all_succeeded and lookups:
+                return "\n".join(f"{query} → {result}" for query, result in lookups)
             
             # Send tool results back to model
-            messages.append({
+            messages.append(orjson.dumps({
                 "role": "user",
                 "content": tool_results
-            })
+            }))
             
             # Second API call - send tool results
-            request_body['messages'] = messages
-            
-            response = client.invoke_model(
-                modelId=model_id,
-                body=json.dumps(request_body)
-            )
+            if not stream:
+                response = client.invoke_model(
+                    modelId=MODEL_ID,
+                    body=build_request_body(messages)
+                )
+                return extract_text(orjson.loads(response['body'].read()))
             
-            response_body = json.loads(response['body'].read())
-            print("Model response (after tool use):")
-            print(json.dumps(response_body, indent=2))
-            print("-" * 50)
+            # Stream the answer as it arrives
+            print("Model response (after tool use):", file=out)
+            final_response = stream_model_response(MODEL_ID, build_request_body(messages), out=out)
+            print("-" * 50, file=out)
+            return final_response
         
         # Extract final text response
-        final_response = ""
-        for block in response_body.get('content', []):
-            if block.get('type') == 'text':
-                final_response += block.get('text', '')
-        
-        return final_response
+        return extract_text(response_body)
         
     except Exception as e:
-        print(f"Error invoking model: {str(e)}")
+        print(f"Error invoking model: {str(e)}", file=out)
         return None
 
 
@@ -183,29 +302,37 @@ def main():
     print("=" * 50)
     print()
 
-    # Example 1: Ask for a specific CPF
-    print("Example 1: Direct CPF lookup")
-    user_query = "What is the full name of the person with CPF 123.456.789-00?"
-    response = invoke_model_with_tools(user_query)
-    if response:
-        print(f"\nFinal Response:\n{response}")
-    print("\n" + "=" * 50 + "\n")
-
-    # Example 2: Ask for multiple CPFs
-    print("Example 2: Multiple CPF lookup")
-    user_query = "Can you tell me the names for these CPFs: 987.654.321-00 and 11122233344?"
-    response = invoke_model_with_tools(user_query)
-    if response:
-        print(f"\nFinal Response:\n{response}")
-    print("\n" + "=" * 50 + "\n")
-
-    # Example 3: CPF not in database
-    print("Example 3: CPF not found")
-    user_query = "Who has CPF 999.999.999-99?"
-    response = invoke_model_with_tools(user_query)
-    if response:
-        print(f"\nFinal Response:\n{response}")
-    print("\n" + "=" * 50 + "\n")
+    examples = [
+        # Example 1: Ask for a specific CPF
+        ("Example 1: Direct CPF lookup",
+         "What is the full name of the person with CPF 123.456.789-00?"),
+        # Example 2: Ask for multiple CPFs
+        ("Example 2: Multiple CPF lookup",
+         "Can you tell me the names for these CPFs: 987.654.321-00 and 11122233344?"),
+        # Example 3: CPF not in database
+        ("Example 3: CPF not found",
+         "Who has CPF 999.999.999-99?"),
+    ]
+
+    # The examples are independent, so run them concurrently. Threads are
+    # enough here: botocore releases the GIL while waiting on the network,
+    # so the examples finish in about the time of the slowest one. Each
+    # example logs into its own buffer and streaming is off, so the output
+    # is printed in order below instead of interleaving
+    logs = [io.StringIO() for _ in examples]
+    with ThreadPoolExecutor(max_workers=len(examples)) as executor:
+        responses = list(executor.map(
+            lambda query, log: invoke_model_with_tools(query, stream=False, out=log),
+            [query for _, query in examples],
+            logs
+        ))
+
+    for (title, _), log, response in zip(examples, logs, responses):
+        print(title)
+        print(log.getvalue(), end='')
+        if response:
+            print(f"\nFinal Response:\n{response}")
+        print("\n" + "=" * 50 + "\n")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Pickled botocore service model cache
+
+Creating a boto3 client parses several large JSON data files (service
+model, endpoint rules, partitions). Run this script once to store them
+as pickles, which load several times faster:
+
+    python prewarm.py
+
+Scripts then call install() before creating their clients, so botocore
+reads the pickles instead of the JSON files.
+"""
+
+import os
+import pickle
+
+import botocore
+from botocore.loaders import JSONFileLoader
+
+# Services used by the scripts in this repository
+SERVICES = ['bedrock-runtime', 'bedrock', 'iam', 'sts']
+
+# Cache location, per botocore version so upgrades never read stale models
+CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    '.botocore-cache',
+    botocore.__version__
+)
+
+_original_load_file = JSONFileLoader.load_file
+
+
+def _cache_path(file_path):
+    """Return the pickle path for a botocore data file path (without extension)."""
+    return os.path.join(CACHE_DIR, os.path.abspath(file_path).lstrip(os.sep) + '.pkl')
+
+
+def _load_file(self, file_path):
+    """Load a data file from the pickle cache, falling back to the JSON file."""
+    try:
+        with open(_cache_path(file_path), 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return _original_load_file(self, file_path)
+
+
+def _load_and_store_file(self, file_path):
+    """Load a data file from JSON and store it in the pickle cache."""
+    data = _original_load_file(self, file_path)
+    if data is not None:
+        cache_file = _cache_path(file_path)
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(cache_file, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return data
+
+
+def install():
+    """Make botocore prefer pickled data files when they exist."""
+    JSONFileLoader.load_file = _load_file
+
+
+def prewarm(services=SERVICES, region_name='us-west-2'):
+    """Create a client per service, pickling every data file it loads."""
+    import boto3
+
+    JSONFileLoader.load_file = _load_and_store_file
+    try:
+        session = boto3.Session(region_name=region_name)
+        for service in services:
+            session.client(service)
+            print(f"✓ Cached service model: {service}")
+    finally:
+        JSONFileLoader.load_file = _original_load_file
+    print(f"Cache written to: {CACHE_DIR}")
+
+
+if __name__ == "__main__":
+    prewarm()
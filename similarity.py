@@ -1,5 +1,8 @@
 #!/usr/bin/env python3
 
+import numpy as np
+
+
 def cosineSimilarity(vec1, vec2):
     """
     Calculate cosine similarity between two vectors.
@@ -11,16 +14,150 @@ def cosineSimilarity(vec1, vec2):
     Returns:
         float: Cosine similarity value between -1 and 1
     """
-    # Calculate dot product
-    dot_product = sum(a * b for a, b in zip(vec1, vec2))
+    # Convert once to contiguous float32 arrays (no copy if already one)
+    a = np.ascontiguousarray(vec1, dtype=np.float32)
+    b = np.ascontiguousarray(vec2, dtype=np.float32)
 
     # Calculate magnitudes
-    magnitude1 = sum(a * a for a in vec1) ** 0.5
-    magnitude2 = sum(b * b for b in vec2) ** 0.5
+    magnitude1 = np.linalg.norm(a)
+    magnitude2 = np.linalg.norm(b)
 
     # Avoid division by zero
     if magnitude1 == 0 or magnitude2 == 0:
         return 0.0
 
     # Calculate cosine similarity
-    return dot_product / (magnitude1 * magnitude2)
+    return float(a @ b / (magnitude1 * magnitude2))
+
+
+def cosineSimilarityBatch(query, matrix):
+    """
+    Calculate cosine similarity between a query vector and every row of a matrix.
+
+    Args:
+        query: Query vector (list or array of numbers)
+        matrix: 2-D array (or list of vectors), one vector per row
+
+    Returns:
+        numpy.ndarray: Cosine similarity of each row with the query
+    """
+    q = np.ascontiguousarray(query, dtype=np.float32)
+    m = np.ascontiguousarray(matrix, dtype=np.float32)
+
+    # Calculate magnitudes
+    query_norm = np.linalg.norm(q)
+    row_norms = np.linalg.norm(m, axis=1)
+
+    # Avoid division by zero
+    denominator = row_norms * query_norm
+    dot_products = m @ q
+    return np.divide(dot_products, denominator,
+                     out=np.zeros_like(dot_products), where=denominator != 0)
+
+
+def normalize(vec):
+    """
+    Scale a vector (or every row of a matrix) to unit L2 norm.
+
+    Args:
+        vec: Vector or 2-D array of vectors
+
+    Returns:
+        numpy.ndarray: float32 array with unit-length rows
+    """
+    v = np.ascontiguousarray(vec, dtype=np.float32)
+    norms = np.linalg.norm(v, axis=-1, keepdims=True)
+    return np.divide(v, norms, out=np.zeros_like(v), where=norms != 0)
+
+
+# Rows upcast to float32 per BLAS call by the reduced-precision paths;
+# small enough for the float32 buffer to stay in cache
+BLOCK_ROWS = 128
+
+
+def _blockedDot(matrix, query):
+    """
+    Multiply a (possibly reduced-precision) matrix by a float32 vector.
+
+    NumPy has no BLAS kernel for float16 or int8, so the rows are upcast
+    in fixed-size blocks into one reused float32 buffer and multiplied
+    with the float32 BLAS kernel.
+
+    Args:
+        matrix: 2-D array, one vector per row
+        query: float32 vector
+
+    Returns:
+        numpy.ndarray: float32 dot product of each row with the query
+    """
+    rows = matrix.shape[0]
+    result = np.empty(rows, dtype=np.float32)
+    buffer = np.empty((min(rows, BLOCK_ROWS), matrix.shape[1]), dtype=np.float32)
+    for start in range(0, rows, BLOCK_ROWS):
+        block = matrix[start:start + BLOCK_ROWS]
+        upcast = buffer[:block.shape[0]]
+        upcast[...] = block
+        np.matmul(upcast, query, out=result[start:start + block.shape[0]])
+    return result
+
+
+def cosineSimilarityF16(vec1, vec2):
+    """
+    Calculate cosine similarity between L2-normalized vectors stored in float16.
+
+    Storing a corpus as float16 halves its memory footprint, but NumPy
+    converts float16 in software, so a query is slower than with the
+    float32 path. Inputs must already be normalized (see normalize), so
+    the dot product is the cosine similarity.
+
+    Args:
+        vec1: First normalized vector
+        vec2: Second normalized vector (or matrix of row vectors)
+
+    Returns:
+        float or numpy.ndarray: Cosine similarity value(s) between -1 and 1
+    """
+    a = np.asarray(vec1, dtype=np.float32)
+    b = np.asarray(vec2, dtype=np.float16)
+    if b.ndim > 1:
+        return _blockedDot(b, a)
+    return float(a @ b.astype(np.float32))
+
+
+def quantizeInt8(vec):
+    """
+    Quantize a normalized vector (or matrix of row vectors) to int8.
+
+    Args:
+        vec: Vector or 2-D array of vectors
+
+    Returns:
+        tuple: (int8 array, scale) where original ~= int8 array * scale
+    """
+    v = np.asarray(vec, dtype=np.float32)
+    max_abs = float(np.max(np.abs(v))) if v.size else 0.0
+    scale = max_abs / 127.0 if max_abs else 1.0
+    return np.round(v / scale).astype(np.int8), scale
+
+
+def cosineSimilarityI8(vec1_i8, vec2_i8, scale1, scale2):
+    """
+    Calculate cosine similarity between int8-quantized normalized vectors.
+
+    Storing a corpus as int8 quarters its memory footprint. Vectors must
+    be L2-normalized before quantization (see quantizeInt8).
+
+    Args:
+        vec1_i8: First quantized vector
+        vec2_i8: Second quantized vector (or matrix of row vectors)
+        scale1: Scale returned by quantizeInt8 for the first vector
+        scale2: Scale returned by quantizeInt8 for the second vector
+
+    Returns:
+        float or numpy.ndarray: Cosine similarity value(s) between -1 and 1
+    """
+    a = np.asarray(vec1_i8, dtype=np.float32)
+    b = np.asarray(vec2_i8, dtype=np.int8)
+    if b.ndim > 1:
+        return _blockedDot(b, a) * np.float32(scale1 * scale2)
+    return float(a @ b.astype(np.float32)) * (scale1 * scale2)